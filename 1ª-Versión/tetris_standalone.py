@@ -4,6 +4,8 @@ Juego completo de Tetris en un solo archivo
 Sin conexión a servidor - Solo se puede jugar localmente
 """
 
+import collections
+import functools
 import pygame
 import random
 import sys
@@ -37,16 +39,26 @@ RED = (255, 0, 0)           # Pieza Z
 BLUE = (0, 0, 255)          # Pieza J
 ORANGE = (255, 165, 0)      # Pieza L
 
-# Colores asignados a cada tipo de pieza
-PIECE_COLORS = {
-    'I': CYAN,
-    'O': YELLOW,
-    'T': MAGENTA,
-    'S': GREEN,
-    'Z': RED,
-    'J': BLUE,
-    'L': ORANGE
-}
+# Tipos de pieza indexados por su identificador numérico (el que se guarda
+# en el tablero y en cada pieza). 0 se reserva para las celdas vacías
+EMPTY = 0
+PIECE_TYPES = (None, 'I', 'O', 'T', 'S', 'Z', 'J', 'L')
+
+# Identificador numérico de cada letra: PIECE_ID['I'] = 1, etc.
+PIECE_ID = {piece_type: piece_id
+            for piece_id, piece_type in enumerate(PIECE_TYPES) if piece_type}
+
+# Colores asignados a cada tipo de pieza, indexados por PIECE_ID
+PIECE_COLORS = (
+    None,       # EMPTY
+    CYAN,       # I
+    YELLOW,     # O
+    MAGENTA,    # T
+    GREEN,      # S
+    RED,        # Z
+    BLUE,       # J
+    ORANGE      # L
+)
 
 # Velocidad del juego
 FPS = 60                    # Frames por segundo
@@ -141,6 +153,119 @@ PIECES = {
     ]
 }
 
+def shape_to_offsets(shape):
+    """
+    Convierte la matriz de una rotación en la lista de sus bloques
+    Returns: Tupla de desplazamientos (dx, dy) respecto a la esquina de la pieza
+    """
+    return tuple((col_idx, row_idx)
+                 for row_idx, row in enumerate(shape)
+                 for col_idx, cell in enumerate(row)
+                 if cell)
+
+def shape_to_row_masks(shape):
+    """
+    Convierte la matriz de una rotación en una máscara de bits por fila
+    El bit c está a 1 si la columna c de esa fila tiene bloque
+    Returns: Tupla con un entero por cada fila de la pieza
+    """
+    return tuple(sum(1 << col_idx for col_idx, cell in enumerate(row) if cell)
+                 for row in shape)
+
+def offsets_to_bottoms(offsets):
+    """
+    Calcula el bloque más bajo de cada columna de una rotación
+    Returns: Tupla de (dx, dy máximo) para cada columna ocupada
+    """
+    bottoms = {}
+    for dx, dy in offsets:
+        bottoms[dx] = max(dy, bottoms.get(dx, dy))
+    return tuple(sorted(bottoms.items()))
+
+def make_validator(row_masks):
+    """
+    Crea la función de colisión especializada para una rotación concreta
+    Todo lo que depende solo de la forma (ancho, alto, filas con bloques) se
+    calcula aquí una vez, y los límites del tablero quedan reducidos a tres
+    comparaciones con constantes. Cada fila de la pieza se desplaza px bits
+    y se compara con la fila del tablero con un único AND
+    Returns: Función validator(rows, px, py) -> True si la pieza cabe
+    """
+    piece_width = max(mask.bit_length() for mask in row_masks)
+    max_x = BOARD_WIDTH - piece_width           # Columna más a la derecha posible
+    max_y = BOARD_HEIGHT - len(row_masks)       # Fila más baja posible
+    masks = tuple(enumerate(row_masks))
+
+    def validator(rows, px, py):
+        # Verificar límites horizontales (izquierda y derecha) y límite inferior
+        if px < 0 or px > max_x or py > max_y:
+            return False
+
+        # Verificar colisión con bloques existentes
+        # (las filas con y < 0 están libres: las piezas nuevas pueden
+        # estar parcialmente arriba)
+        for dy, mask in masks:
+            y = py + dy
+            if y >= 0 and (mask << px) & rows[y]:
+                return False
+
+        return True
+
+    return validator
+
+# Todo lo que se calcula de una rotación de una pieza
+Shape = collections.namedtuple("Shape", [
+    "type_id",      # Tipo de pieza (PIECE_ID)
+    "rotation",     # Índice de la rotación (0, 1, 2, 3)
+    "matrix",       # Matriz original de PIECES
+    "offsets",      # Bloques: ((dx, dy), ...) solo de las celdas llenas
+    "row_masks",    # Máscara de bits de cada fila
+    "bottoms",      # Bloque más bajo de cada columna (caída instantánea)
+    "validator",    # Función de colisión (ver make_validator)
+    "next",         # Índice en SHAPES de la siguiente rotación
+])
+
+def build_shapes():
+    """
+    Precalcula todas las rotaciones de todas las piezas en una sola tabla
+    Returns: (SHAPES, SHAPE_INDEX) donde SHAPE_INDEX[(PIECE_ID, rotación)]
+             es la posición de esa rotación en SHAPES
+    """
+    shapes = []
+    index = {}
+    for piece_type, rotations in PIECES.items():
+        type_id = PIECE_ID[piece_type]
+        first = len(shapes)     # Índice de la rotación 0 de esta pieza
+        for rotation, matrix in enumerate(rotations):
+            offsets = shape_to_offsets(matrix)
+            row_masks = shape_to_row_masks(matrix)
+            index[(type_id, rotation)] = len(shapes)
+            shapes.append(Shape(type_id, rotation, matrix, offsets, row_masks,
+                                offsets_to_bottoms(offsets),
+                                make_validator(row_masks),
+                                first + (rotation + 1) % len(rotations)))
+    return tuple(shapes), index
+
+# Tabla única de formas: una pieza solo guarda su índice en SHAPES
+SHAPES, SHAPE_INDEX = build_shapes()
+
+# Wall kicks: desplazamientos (dx, dy) que se prueban, en orden, cuando una
+# rotación no cabe en su sitio. Son fijos, así que se crean una sola vez
+# Para la pieza I necesitamos más desplazamientos
+KICKS_I = (
+    (1, 0), (-1, 0), (2, 0), (-2, 0), (3, 0), (-3, 0),
+    (0, -1), (1, -1), (-1, -1),
+)
+# Resto de piezas (la O nunca los necesita: su rotación siempre cabe)
+KICKS_JLSTZ = (
+    (1, 0), (-1, 0), (2, 0), (-2, 0),
+    (0, -1), (1, -1), (-1, -1),
+)
+
+# Tabla de wall kicks de cada tipo de pieza, indexada por PIECE_ID
+PIECE_KICKS = tuple(KICKS_I if piece_type == 'I' else KICKS_JLSTZ
+                    for piece_type in PIECE_TYPES)
+
 # ============================================================================
 # CLASE PIECE (PIEZA)
 # ============================================================================
@@ -148,48 +273,41 @@ PIECES = {
 class Piece:
     """Representa una pieza individual del Tetris"""
 
-    def __init__(self, piece_type=None):
+    def __init__(self, type_id=None):
         """
         Inicializa una pieza
-        piece_type: Tipo de pieza ('I', 'O', 'T', etc.) o None para aleatorio
+        type_id: Tipo de pieza (PIECE_ID['I'], PIECE_ID['O'], etc.) o None para aleatorio
         """
-        # Si no se especifica tipo, elegir uno al azar
-        if piece_type is None:
-            self.type = random.choice(list(PIECES.keys()))
+        # Si no se especifica tipo, elegir uno al azar (de 1 a 7, el 0 es EMPTY)
+        if type_id is None:
+            self.type_id = random.randint(1, len(PIECE_TYPES) - 1)
         else:
-            self.type = piece_type
+            self.type_id = type_id
 
-        self.rotation = 0                           # Índice de rotación actual (0, 1, 2, 3)
-        self.rotations = PIECES[self.type]          # Lista de todas las rotaciones de esta pieza
-        self.shape = self.rotations[self.rotation]  # Forma actual (matriz)
+        self.shape_idx = SHAPE_INDEX[(self.type_id, 0)]  # Forma actual: índice en SHAPES
         self.x = 3                                  # Posición X inicial (columna 3)
         self.y = 0                                  # Posición Y inicial (fila 0 = arriba)
 
     def rotate(self):
         """Rota la pieza al siguiente estado de rotación"""
-        # Avanzar al siguiente índice de rotación (circular)
-        self.rotation = (self.rotation + 1) % len(self.rotations)
-        # Actualizar la forma según la nueva rotación
-        self.shape = self.rotations[self.rotation]
+        self.shape_idx = SHAPES[self.shape_idx].next
 
     def get_positions(self):
         """
         Devuelve las posiciones absolutas de todos los bloques de la pieza
         Returns: Lista de tuplas (x, y)
         """
-        positions = []
-        # Recorrer cada celda de la matriz de la pieza
-        for row_idx, row in enumerate(self.shape):
-            for col_idx, cell in enumerate(row):
-                if cell:  # Si hay un bloque (1)
-                    # Calcular posición absoluta: posición de la pieza + offset en la matriz
-                    positions.append((self.x + col_idx, self.y + row_idx))
-        return positions
+        # Posición absoluta: posición de la pieza + offset de cada bloque
+        x, y = self.x, self.y
+        return [(x + dx, y + dy) for dx, dy in SHAPES[self.shape_idx].offsets]
 
 # ============================================================================
 # CLASE BOARD (TABLERO)
 # ============================================================================
 
+# Valor de una fila completa: los BOARD_WIDTH bits a 1 (0b1111111111)
+FULL_ROW = (1 << BOARD_WIDTH) - 1
+
 class Board:
     """Representa el tablero de juego donde caen las piezas"""
 
@@ -197,66 +315,92 @@ class Board:
         """Inicializa un tablero vacío"""
         self.width = BOARD_WIDTH    # 10 columnas
         self.height = BOARD_HEIGHT  # 20 filas
-        # Crear matriz vacía: None significa celda vacía
+        # Crear matriz vacía: EMPTY (0) significa celda vacía
+        # y cualquier otro valor es el PIECE_ID del bloque fijado
         # grid[fila][columna]
-        self.grid = [[None for _ in range(self.width)] for _ in range(self.height)]
+        self.grid = [[EMPTY] * self.width for _ in range(self.height)]
+        # Las mismas celdas como máscara de bits: una fila = un entero
+        # (bit c a 1 si la columna c está ocupada) para las colisiones
+        self.rows = [0] * self.height
+        # Contador de cambios de los bloques fijos: se incrementa cada vez que
+        # el grid cambia, así el renderizado sabe cuándo debe redibujarlo
+        self.version = 0
 
     def is_valid_position(self, piece):
         """
         Verifica si una pieza está en una posición válida
         Returns: True si es válida, False si hay colisión
         """
-        positions = piece.get_positions()
+        return SHAPES[piece.shape_idx].validator(self.rows, piece.x, piece.y)
 
-        for x, y in positions:
-            # Verificar límites horizontales (izquierda y derecha)
-            if x < 0 or x >= self.width:
-                return False
+    def is_valid_placement(self, validator, x, y):
+        """
+        Verifica si una forma cabe en (x, y) sin tener que mover la pieza
+        validator: Función de colisión de la forma (ver Shape)
+        Permite probar movimientos y wall kicks antes de aplicarlos
+        Returns: True si es válida, False si hay colisión
+        """
+        return validator(self.rows, x, y)
 
-            # Verificar límite inferior
-            if y >= self.height:
-                return False
+    def drop_distance(self, piece):
+        """
+        Calcula cuántas filas puede bajar la pieza antes de chocar
+        Basta con mirar, en cada columna de la pieza, cuántas celdas libres
+        hay debajo de su bloque más bajo: la menor de ellas es la caída
+        Returns: Número de filas que puede descender
+        """
+        px, py = piece.x, piece.y
+        distance = self.height
 
-            # Verificar colisión con bloques existentes
-            # (y >= 0 porque las piezas nuevas pueden estar parcialmente arriba)
-            if y >= 0 and self.grid[y][x] is not None:
-                return False
+        for dx, dy in SHAPES[piece.shape_idx].bottoms:
+            x = px + dx
+            start = py + dy + 1
+            # No hace falta buscar más allá de la menor caída encontrada
+            end = min(self.height, start + distance)
 
-        return True
+            y = start
+            while y < end and (y < 0 or self.grid[y][x] == EMPTY):
+                y += 1
+            distance = y - start
+
+        return distance
 
     def lock_piece(self, piece):
         """
         Fija una pieza en el tablero (la convierte en bloques estáticos)
         """
-        positions = piece.get_positions()
+        px, py = piece.x, piece.y
+        piece_id = piece.type_id
 
-        for x, y in positions:
+        for dx, dy in SHAPES[piece.shape_idx].offsets:
+            x = px + dx
+            y = py + dy
             if y >= 0:  # Solo fijar bloques que estén dentro del tablero
                 # Guardar el tipo de pieza para saber qué color usar
-                self.grid[y][x] = piece.type
+                self.grid[y][x] = piece_id
+                self.rows[y] |= 1 << x
+        self.version += 1
 
     def clear_lines(self):
         """
         Elimina las líneas completas y devuelve cuántas se eliminaron
         Returns: Número de líneas eliminadas
         """
-        lines_cleared = 0
-        new_grid = []
-
-        # Recorrer todas las filas
-        for row in self.grid:
-            # Si la fila tiene algún None (espacio vacío), no está completa
-            if None in row:
-                new_grid.append(row)
-            else:
-                # Fila completa - no la agregamos (se elimina)
-                lines_cleared += 1
-
-        # Agregar filas vacías arriba por cada línea eliminada
-        for _ in range(lines_cleared):
-            new_grid.insert(0, [None for _ in range(self.width)])
-
-        self.grid = new_grid
+        # Caso más habitual: ninguna fila completa, no hay nada que rehacer
+        if FULL_ROW not in self.rows:
+            return 0
+
+        # Quedarse solo con las filas incompletas (las completas se eliminan)
+        kept = [y for y, bits in enumerate(self.rows) if bits != FULL_ROW]
+        lines_cleared = self.height - len(kept)
+
+        # Poner de golpe una fila vacía arriba por cada línea eliminada
+        # (en vez de ir insertándolas una a una en la posición 0)
+        self.grid = ([[EMPTY] * self.width for _ in range(lines_cleared)]
+                     + [self.grid[y] for y in kept])
+        self.rows = [0] * lines_cleared + [self.rows[y] for y in kept]
+
+        self.version += 1
         return lines_cleared
 
     def is_game_over(self):
@@ -265,11 +409,13 @@ class Board:
         Returns: True si game over, False si puede continuar
         """
         # Si hay algún bloque en la fila superior (y=0), es game over
-        return any(cell is not None for cell in self.grid[0])
+        return self.rows[0] != 0
 
     def reset(self):
         """Reinicia el tablero a vacío"""
-        self.grid = [[None for _ in range(self.width)] for _ in range(self.height)]
+        self.grid = [[EMPTY] * self.width for _ in range(self.height)]
+        self.rows = [0] * self.height
+        self.version += 1
 
 # ============================================================================
 # CLASE TETRIS (LÓGICA DEL JUEGO)
@@ -287,82 +433,76 @@ class Tetris:
         self.lines_cleared = 0              # Total de líneas eliminadas
         self.game_over = False              # Estado del juego
 
-        self.last_fall_time = pygame.time.get_ticks()  # Timestamp de última caída
-        self.fall_speed = FALL_SPEED                    # Velocidad de caída
+        self.fall_timer = 0                 # Milisegundos acumulados desde la última caída
+        self.fall_speed = FALL_SPEED        # Velocidad de caída
 
     def move_left(self):
         """Intenta mover la pieza actual hacia la izquierda"""
-        self.current_piece.x -= 1           # Mover una posición a la izquierda
-        if not self.board.is_valid_position(self.current_piece):
-            self.current_piece.x += 1       # Revertir si hay colisión
+        piece = self.current_piece
+        validator = SHAPES[piece.shape_idx].validator
+        # Solo se mueve si la posición de destino está libre
+        if self.board.is_valid_placement(validator, piece.x - 1, piece.y):
+            piece.x -= 1
 
     def move_right(self):
         """Intenta mover la pieza actual hacia la derecha"""
-        self.current_piece.x += 1           # Mover una posición a la derecha
-        if not self.board.is_valid_position(self.current_piece):
-            self.current_piece.x -= 1       # Revertir si hay colisión
+        piece = self.current_piece
+        validator = SHAPES[piece.shape_idx].validator
+        # Solo se mueve si la posición de destino está libre
+        if self.board.is_valid_placement(validator, piece.x + 1, piece.y):
+            piece.x += 1
 
     def move_down(self):
         """
         Intenta mover la pieza hacia abajo
         Returns: True si se movió, False si se fijó
         """
-        self.current_piece.y += 1           # Bajar una posición
-        if not self.board.is_valid_position(self.current_piece):
-            self.current_piece.y -= 1       # Revertir
-            self.lock_piece()               # Fijar la pieza
+        piece = self.current_piece
+        validator = SHAPES[piece.shape_idx].validator
+        if not self.board.is_valid_placement(validator, piece.x, piece.y + 1):
+            self.lock_piece()               # No puede bajar: fijar la pieza
             return False
+        piece.y += 1                        # Bajar una posición
         return True
 
     def hard_drop(self):
         """Deja caer la pieza instantáneamente hasta el fondo"""
-        # Seguir bajando hasta que no se pueda más
-        while self.move_down():
-            pass
+        # Bajar de golpe todas las filas libres y fijar la pieza
+        self.current_piece.y += self.board.drop_distance(self.current_piece)
+        self.lock_piece()
 
     def rotate_piece(self):
         """Intenta rotar la pieza actual con sistema de wall kicks"""
-        # Guardar estado actual por si hay que revertir
-        old_rotation = self.current_piece.rotation
-        old_shape = self.current_piece.shape
-        old_x = self.current_piece.x
-        old_y = self.current_piece.y
-
-        # Intentar rotar
-        self.current_piece.rotate()
-
-        # Si la rotación es válida, listo
-        if self.board.is_valid_position(self.current_piece):
+        piece = self.current_piece
+
+        # Forma de la nueva rotación: se prueba sin tocar la pieza,
+        # así no hay nada que revertir si ninguna posición es válida
+        new_shape_idx = SHAPES[piece.shape_idx].next
+        validator = SHAPES[new_shape_idx].validator
+        old_x = piece.x
+        old_y = piece.y
+
+        # Si la rotación es válida en el sitio, listo
+        if self.board.is_valid_placement(validator, old_x, old_y):
+            piece.shape_idx = new_shape_idx
             return
 
         # Si no es válida, intentar "wall kicks" (empujar la pieza)
         # Wall kicks = intentar mover la pieza a los lados antes de cancelar rotación
 
         # Para la pieza I necesitamos más desplazamientos
-        if self.current_piece.type == 'I':
-            kick_tests = [
-                (1, 0), (-1, 0), (2, 0), (-2, 0), (3, 0), (-3, 0),
-                (0, -1), (1, -1), (-1, -1),
-            ]
-        else:
-            kick_tests = [
-                (1, 0), (-1, 0), (2, 0), (-2, 0),
-                (0, -1), (1, -1), (-1, -1),
-            ]
+        kick_tests = PIECE_KICKS[piece.type_id]
 
         # Probar cada desplazamiento
         for dx, dy in kick_tests:
-            self.current_piece.x = old_x + dx
-            self.current_piece.y = old_y + dy
-
-            if self.board.is_valid_position(self.current_piece):
-                return  # ¡Funcionó con este desplazamiento!
+            if self.board.is_valid_placement(validator, old_x + dx, old_y + dy):
+                # ¡Funcionó con este desplazamiento!
+                piece.shape_idx = new_shape_idx
+                piece.x = old_x + dx
+                piece.y = old_y + dy
+                return
 
-        # Ningún kick funcionó - revertir rotación completamente
-        self.current_piece.rotation = old_rotation
-        self.current_piece.shape = old_shape
-        self.current_piece.x = old_x
-        self.current_piece.y = old_y
+        # Ningún kick funcionó - la pieza se queda como estaba
 
     def lock_piece(self):
         """Fija la pieza actual y genera una nueva"""
@@ -390,18 +530,23 @@ class Tetris:
         if not self.board.is_valid_position(self.current_piece):
             self.game_over = True
 
-    def update(self):
-        """Actualiza el estado del juego (caída automática)"""
+    def update(self, dt):
+        """
+        Actualiza el estado del juego (caída automática)
+        dt: Milisegundos transcurridos desde el frame anterior (lo que devuelve clock.tick)
+        """
         if self.game_over:
             return
 
-        # Obtener tiempo actual
-        current_time = pygame.time.get_ticks()
+        # Acumular el tiempo del frame
+        self.fall_timer += dt
 
         # Si ha pasado suficiente tiempo, bajar la pieza automáticamente
-        if current_time - self.last_fall_time > self.fall_speed:
+        if self.fall_timer >= self.fall_speed:
             self.move_down()
-            self.last_fall_time = current_time
+            # Conservar el sobrante para mantener el ritmo, pero sin acumular
+            # varias caídas pendientes si el juego se ha quedado parado
+            self.fall_timer %= self.fall_speed
 
     def reset(self):
         """Reinicia el juego a estado inicial"""
@@ -411,80 +556,156 @@ class Tetris:
         self.score = 0
         self.lines_cleared = 0
         self.game_over = False
-        self.last_fall_time = pygame.time.get_ticks()
+        self.fall_timer = 0
 
 # ============================================================================
 # FUNCIONES DE RENDERIZADO
 # ============================================================================
 
-def draw_board(screen, board):
-    """Dibuja el tablero y los bloques fijos"""
-    # Calcular dimensiones del tablero en píxeles
+# Superficies precalculadas de cada bloque, indexadas por PIECE_ID
+# Se rellenan en init_block_surfaces() tras crear la ventana
+BLOCK_SURFACES = [None] * len(PIECE_COLORS)     # Bloque del tablero: relleno + borde blanco
+PREVIEW_SURFACES = [None] * len(PIECE_COLORS)   # Bloque de la vista previa: solo relleno
+
+# Posición en píxeles de cada columna y fila dentro del tablero
+# (se calculan una vez en vez de multiplicar en cada frame)
+COL_PX = tuple(col * BLOCK_SIZE for col in range(BOARD_WIDTH))
+ROW_PX = tuple(row * BLOCK_SIZE for row in range(BOARD_HEIGHT))
+
+def init_block_surfaces():
+    """
+    Pre-renderiza un bloque de cada color una sola vez
+    Debe llamarse después de pygame.display.set_mode() para poder usar convert()
+    """
+    for piece_id in range(1, len(PIECE_TYPES)):
+        color = PIECE_COLORS[piece_id]
+        # Bloque del tablero: relleno de color con borde blanco de 1 píxel
+        block = pygame.Surface((BLOCK_SIZE, BLOCK_SIZE))
+        block.fill(color, (1, 1, BLOCK_SIZE - 2, BLOCK_SIZE - 2))
+        pygame.draw.rect(block, WHITE, (0, 0, BLOCK_SIZE, BLOCK_SIZE), 1)
+        # convert() lo pasa al formato de la pantalla para que el blit sea rápido
+        BLOCK_SURFACES[piece_id] = block.convert()
+
+        # Bloque de la vista previa: relleno sin borde, algo más pequeño
+        preview = pygame.Surface((BLOCK_SIZE - 2, BLOCK_SIZE - 2))
+        preview.fill(color)
+        PREVIEW_SURFACES[piece_id] = preview.convert()
+
+# Caché de los bloques fijos: una superficie del tamaño del tablero que solo
+# se vuelve a dibujar cuando el grid cambia (pieza fijada, líneas, reinicio)
+_locked_cache = {"board": None, "version": None, "surface": None}
+
+@functools.lru_cache(maxsize=1)
+def board_frame():
+    """
+    Crea el fondo del tablero (negro con el borde gris) la primera vez
+    Es lo primero que se copia cada vez que se redibujan los bloques fijos
+    Returns: Superficie del tamaño del tablero
+    """
     board_width = BOARD_WIDTH * BLOCK_SIZE
     board_height = BOARD_HEIGHT * BLOCK_SIZE
 
+    frame = pygame.Surface((board_width, board_height)).convert()
+    frame.fill(BLACK)
     # Dibujar borde del tablero
-    pygame.draw.rect(screen, GRAY,
-                     (BOARD_X, BOARD_Y, board_width, board_height), 2)
+    pygame.draw.rect(frame, GRAY, (0, 0, board_width, board_height), 2)
+    return frame
+
+def render_locked_blocks(board):
+    """
+    Devuelve la superficie con el borde y los bloques fijos del tablero
+    Solo se redibuja si el tablero ha cambiado desde la última vez
+    """
+    if _locked_cache["board"] is board and _locked_cache["version"] == board.version:
+        return _locked_cache["surface"]
+
+    # Empezar desde el fondo con el borde ya dibujado
+    surface = _locked_cache["surface"]
+    if surface is None:
+        surface = board_frame().copy()
+    else:
+        surface.blit(board_frame(), (0, 0))
+
+    # Reunir todos los bloques fijos y dibujarlos con una sola llamada
+    blit_sequence = []
+    for row_px, row in zip(ROW_PX, board.grid):
+        for col_px, cell in zip(COL_PX, row):
+            if cell != EMPTY:  # Si hay un bloque
+                blit_sequence.append((BLOCK_SURFACES[cell], (col_px, row_px)))
+    surface.blits(blit_sequence, doreturn=False)
+
+    _locked_cache["board"] = board
+    _locked_cache["version"] = board.version
+    _locked_cache["surface"] = surface
+    return surface
+
+@functools.lru_cache(maxsize=128)
+def render_text(text, font, color):
+    """
+    Renderiza un texto y guarda el resultado para los siguientes frames
+    Casi todos los textos son fijos, así que FreeType solo los rasteriza una vez
+    Solo puede usarse con la ventana ya creada (por el convert_alpha())
+    Returns: Superficie con el texto
+    """
+    # convert_alpha() la deja en el formato de la pantalla para que el blit
+    # no tenga que convertir cada píxel en cada frame
+    return font.render(text, True, color).convert_alpha()
 
-    # Dibujar cada bloque fijo del tablero
-    for row_idx, row in enumerate(board.grid):
-        for col_idx, cell in enumerate(row):
-            if cell is not None:  # Si hay un bloque
-                draw_block(screen, col_idx, row_idx, PIECE_COLORS[cell])
+def draw_board(screen, board):
+    """
+    Dibuja el tablero y los bloques fijos
+    Returns: Rect de la zona de pantalla que ocupa el tablero
+    """
+    # Un único blit con todo lo que no se mueve
+    return screen.blit(render_locked_blocks(board), (BOARD_X, BOARD_Y))
 
 def draw_piece(screen, piece):
-    """Dibuja la pieza actual que está cayendo"""
-    positions = piece.get_positions()
-    color = PIECE_COLORS[piece.type]
-
-    for x, y in positions:
-        if y >= 0:  # Solo dibujar bloques visibles
-            draw_block(screen, x, y, color)
-
-def draw_block(screen, x, y, color):
-    """Dibuja un bloque individual en una posición del tablero"""
-    # Calcular posición en píxeles
-    pixel_x = BOARD_X + x * BLOCK_SIZE
-    pixel_y = BOARD_Y + y * BLOCK_SIZE
-
-    # Dibujar bloque relleno
-    pygame.draw.rect(screen, color,
-                     (pixel_x + 1, pixel_y + 1, BLOCK_SIZE - 2, BLOCK_SIZE - 2))
-    # Dibujar borde del bloque
-    pygame.draw.rect(screen, WHITE,
-                     (pixel_x, pixel_y, BLOCK_SIZE, BLOCK_SIZE), 1)
+    """
+    Dibuja la pieza actual que está cayendo
+    Siempre queda dentro del Rect que devuelve draw_board()
+    """
+    block = BLOCK_SURFACES[piece.type_id]
+
+    # Solo dibujar bloques visibles (y >= 0)
+    screen.blits([(block, (BOARD_X + x * BLOCK_SIZE, BOARD_Y + y * BLOCK_SIZE))
+                  for x, y in piece.get_positions() if y >= 0], doreturn=False)
 
 def draw_next_piece(screen, piece, font):
-    """Dibuja la siguiente pieza (preview)"""
+    """
+    Dibuja la siguiente pieza (preview)
+    Returns: Rect de la zona de pantalla que ocupa la preview
+    """
     next_x = BOARD_X + BOARD_WIDTH * BLOCK_SIZE + 50
     next_y = 100
 
     # Título
-    text = font.render("Siguiente:", True, WHITE)
+    text = render_text("Siguiente:", font, WHITE)
     screen.blit(text, (next_x, next_y - 30))
 
     # Dibujar la pieza
-    color = PIECE_COLORS[piece.type]
-    for row_idx, row in enumerate(piece.shape):
-        for col_idx, cell in enumerate(row):
-            if cell:
-                pixel_x = next_x + col_idx * BLOCK_SIZE
-                pixel_y = next_y + row_idx * BLOCK_SIZE
-                pygame.draw.rect(screen, color,
-                                 (pixel_x, pixel_y, BLOCK_SIZE - 2, BLOCK_SIZE - 2))
+    block = PREVIEW_SURFACES[piece.type_id]
+    screen.blits([(block, (next_x + dx * BLOCK_SIZE, next_y + dy * BLOCK_SIZE))
+                  for dx, dy in SHAPES[piece.shape_idx].offsets], doreturn=False)
+
+    # Zona fija (título + hueco de 4x4 bloques) aunque la pieza sea más pequeña,
+    # así también se actualiza el trozo donde estaba la preview anterior
+    return pygame.Rect(next_x, next_y - 30,
+                       SCREEN_WIDTH - next_x, 30 + 4 * BLOCK_SIZE)
 
 def draw_info(screen, tetris, font, small_font):
-    """Dibuja información del juego (puntuación, líneas, controles)"""
+    """
+    Dibuja información del juego (puntuación, líneas, controles)
+    Returns: Rect de la zona de pantalla que ocupa el panel
+    """
     info_x = BOARD_X + BOARD_WIDTH * BLOCK_SIZE + 50
     info_y = 250
 
     # Puntuación
-    score_text = font.render(f"Puntos: {tetris.score}", True, WHITE)
+    score_text = render_text(f"Puntos: {tetris.score}", font, WHITE)
     screen.blit(score_text, (info_x, info_y))
 
     # Líneas eliminadas
-    lines_text = small_font.render(f"Líneas: {tetris.lines_cleared}", True, WHITE)
+    lines_text = render_text(f"Líneas: {tetris.lines_cleared}", small_font, WHITE)
     screen.blit(lines_text, (info_x, info_y + 40))
 
     # Controles
@@ -500,22 +721,36 @@ def draw_info(screen, tetris, font, small_font):
     ]
 
     for i, control in enumerate(controls):
-        text = small_font.render(control, True, GRAY)
+        text = render_text(control, small_font, GRAY)
         screen.blit(text, (info_x, controls_y + i * 25))
 
+    # Todo el panel hasta el borde derecho: los textos de puntuación cambian de ancho
+    return pygame.Rect(info_x, info_y,
+                       SCREEN_WIDTH - info_x, controls_y + len(controls) * 25 - info_y)
+
+@functools.lru_cache(maxsize=1)
+def game_over_overlay():
+    """
+    Crea el overlay semi-transparente del Game Over la primera vez que se pide
+    Las siguientes llamadas devuelven la misma superficie, sin volver a
+    reservarla ni rellenarla en cada frame
+    """
+    # Transparencia por píxel (SRCALPHA) rellena con negro y alfa 200:
+    # se mezcla con un blit normal, sin set_alpha() sobre toda la superficie
+    overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA).convert_alpha()
+    overlay.fill(BLACK + (200,))
+    return overlay
+
 def draw_game_over(screen, score, font):
     """Dibuja la pantalla de Game Over"""
     # Overlay semi-transparente
-    overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-    overlay.set_alpha(200)
-    overlay.fill(BLACK)
-    screen.blit(overlay, (0, 0))
+    screen.blit(game_over_overlay(), (0, 0))
 
     # Textos
-    game_over_text = font.render("GAME OVER", True, RED)
-    score_text = font.render(f"Puntuacion final: {score}", True, WHITE)
-    restart_text = font.render("Presiona R para reiniciar", True, WHITE)
-    menu_text = font.render("o ESC para volver al menu", True, WHITE)
+    game_over_text = render_text("GAME OVER", font, RED)
+    score_text = render_text(f"Puntuacion final: {score}", font, WHITE)
+    restart_text = render_text("Presiona R para reiniciar", font, WHITE)
+    menu_text = render_text("o ESC para volver al menu", font, WHITE)
 
     # Centrar textos
     text_x = SCREEN_WIDTH // 2 - game_over_text.get_width() // 2
@@ -529,39 +764,56 @@ def draw_game_over(screen, score, font):
 # MENÚ PRINCIPAL
 # ============================================================================
 
-def draw_menu(screen, font, small_font):
-    """Dibuja el menú principal"""
-    screen.fill(BLACK)
+@functools.lru_cache(maxsize=1)
+def render_menu(font, small_font):
+    """
+    Dibuja el menú principal en una superficie del tamaño de la ventana
+    El menú no cambia, así que solo se dibuja la primera vez
+    Returns: Superficie con el menú completo
+    """
+    surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+    surface.fill(BLACK)
 
     # Título
-    title = font.render("T E T R I S", True, CYAN)
+    title = render_text("T E T R I S", font, CYAN)
     title_x = SCREEN_WIDTH // 2 - title.get_width() // 2
-    screen.blit(title, (title_x, 150))
+    surface.blit(title, (title_x, 150))
 
     # Opciones del menú
-    play_text = font.render("1. JUGAR", True, WHITE)
-    controls_text = font.render("2. CONTROLES", True, WHITE)
-    exit_text = font.render("3. SALIR", True, WHITE)
+    play_text = render_text("1. JUGAR", font, WHITE)
+    controls_text = render_text("2. CONTROLES", font, WHITE)
+    exit_text = render_text("3. SALIR", font, WHITE)
 
     menu_x = SCREEN_WIDTH // 2 - play_text.get_width() // 2
 
-    screen.blit(play_text, (menu_x, 300))
-    screen.blit(controls_text, (menu_x, 370))
-    screen.blit(exit_text, (menu_x, 440))
+    surface.blit(play_text, (menu_x, 300))
+    surface.blit(controls_text, (menu_x, 370))
+    surface.blit(exit_text, (menu_x, 440))
 
     # Instrucción
-    instruction = small_font.render("Presiona 1, 2 o 3", True, GRAY)
+    instruction = render_text("Presiona 1, 2 o 3", small_font, GRAY)
     instr_x = SCREEN_WIDTH // 2 - instruction.get_width() // 2
-    screen.blit(instruction, (instr_x, 550))
+    surface.blit(instruction, (instr_x, 550))
+    return surface
 
-def draw_controls_screen(screen, font, small_font):
-    """Dibuja la pantalla de controles"""
-    screen.fill(BLACK)
+def draw_menu(screen, font, small_font):
+    """Dibuja el menú principal"""
+    screen.blit(render_menu(font, small_font), (0, 0))
+
+@functools.lru_cache(maxsize=1)
+def render_controls_screen(font, small_font):
+    """
+    Dibuja la pantalla de controles en una superficie del tamaño de la ventana
+    Como el menú, es estática y solo se dibuja la primera vez
+    Returns: Superficie con la pantalla completa
+    """
+    surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+    surface.fill(BLACK)
 
     # Título
-    title = font.render("CONTROLES", True, CYAN)
+    title = render_text("CONTROLES", font, CYAN)
     title_x = SCREEN_WIDTH // 2 - title.get_width() // 2
-    screen.blit(title, (title_x, 75))
+    surface.blit(title, (title_x, 75))
 
     # Lista de controles
     controls = [
@@ -582,15 +834,76 @@ def draw_controls_screen(screen, font, small_font):
 
     y = 100
     for control in controls:
-        text = small_font.render(control, True, WHITE if control else GRAY)
+        text = render_text(control, small_font, WHITE if control else GRAY)
         text_x = SCREEN_WIDTH // 2 - text.get_width() // 2
-        screen.blit(text, (text_x, y))
+        surface.blit(text, (text_x, y))
         y += 35
 
     # Volver
-    back_text = small_font.render("Presiona ESC para volver", True, GRAY)
+    back_text = render_text("Presiona ESC para volver", small_font, GRAY)
     back_x = SCREEN_WIDTH // 2 - back_text.get_width() // 2
-    screen.blit(back_text, (back_x, 600))
+    surface.blit(back_text, (back_x, 600))
+    return surface
+
+def draw_controls_screen(screen, font, small_font):
+    """Dibuja la pantalla de controles"""
+    screen.blit(render_controls_screen(font, small_font), (0, 0))
+
+# ============================================================================
+# CONTROLES POR ESTADO
+# ============================================================================
+
+# Estados del juego
+STATE_MENU = "menu"
+STATE_PLAYING = "playing"
+STATE_CONTROLS = "controls"
+STATE_GAME_OVER = "game_over"   # Jugando, pero con la partida terminada
+STATE_QUIT = "quit"             # Cerrar el juego
+
+# Acción sobre la partida de cada tecla, según el estado
+# HANDLERS[estado][tecla] = función que recibe el objeto Tetris
+HANDLERS = {
+    STATE_MENU: {},
+    STATE_CONTROLS: {},
+    STATE_PLAYING: {
+        pygame.K_LEFT: Tetris.move_left,
+        pygame.K_RIGHT: Tetris.move_right,
+        pygame.K_DOWN: Tetris.move_down,
+        pygame.K_UP: Tetris.rotate_piece,
+        pygame.K_SPACE: Tetris.hard_drop,
+    },
+    STATE_GAME_OVER: {
+        pygame.K_r: Tetris.reset,
+    },
+}
+
+# Cambio de estado de cada tecla, según el estado
+# TRANSITIONS[estado][tecla] = estado siguiente
+TRANSITIONS = {
+    STATE_MENU: {
+        pygame.K_1: STATE_PLAYING,      # Jugar
+        pygame.K_2: STATE_CONTROLS,     # Controles
+        pygame.K_3: STATE_QUIT,         # Salir
+    },
+    STATE_CONTROLS: {
+        pygame.K_ESCAPE: STATE_MENU,
+    },
+    STATE_PLAYING: {
+        pygame.K_ESCAPE: STATE_MENU,
+    },
+    STATE_GAME_OVER: {
+        pygame.K_ESCAPE: STATE_MENU,
+    },
+}
+
+def active_state(state, tetris):
+    """
+    Devuelve el estado que decide qué teclas funcionan y qué se ve
+    Durante una partida terminada se usa STATE_GAME_OVER en vez de STATE_PLAYING
+    """
+    if state == STATE_PLAYING and tetris.game_over:
+        return STATE_GAME_OVER
+    return state
 
 # ============================================================================
 # FUNCIÓN PRINCIPAL
@@ -605,6 +918,9 @@ def main():
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption("Tetris")
 
+    # Pre-renderizar los bloques (necesita la ventana ya creada)
+    init_block_surfaces()
+
     # Reloj para controlar FPS
     clock = pygame.time.Clock()
 
@@ -612,19 +928,19 @@ def main():
     font = pygame.font.Font(None, 36)
     small_font = pygame.font.Font(None, 24)
 
-    # Estados del juego
-    STATE_MENU = "menu"
-    STATE_PLAYING = "playing"
-    STATE_CONTROLS = "controls"
-
     # Estado inicial
     state = STATE_MENU
     tetris = None
 
+    # Pantalla mostrada en el último frame (ver active_state)
+    # Si cambia hay que subir la ventana entera; si no, solo lo que se mueve
+    last_view = None
+    full_update = True
+
     # Bucle principal del juego
     running = True
     while running:
-        clock.tick(FPS)  # Limitar a 60 FPS
+        dt = clock.tick(FPS)  # Limitar a 60 FPS (devuelve los ms desde el frame anterior)
 
         # Procesar eventos
         for event in pygame.event.get():
@@ -632,70 +948,70 @@ def main():
             if event.type == pygame.QUIT:
                 running = False
 
+            # Evento: la ventana se ha vuelto a mostrar (restaurada, descubierta...)
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                full_update = True
+
             # Evento: tecla presionada
             if event.type == pygame.KEYDOWN:
-                # --- MENÚ PRINCIPAL ---
-                if state == STATE_MENU:
-                    if event.key == pygame.K_1:  # Jugar
-                        state = STATE_PLAYING
-                        tetris = Tetris()  # Crear nuevo juego
-                    elif event.key == pygame.K_2:  # Controles
-                        state = STATE_CONTROLS
-                    elif event.key == pygame.K_3:  # Salir
-                        running = False
-
-                # --- PANTALLA DE CONTROLES ---
-                elif state == STATE_CONTROLS:
-                    if event.key == pygame.K_ESCAPE:
-                        state = STATE_MENU
-
-                # --- JUGANDO ---
-                elif state == STATE_PLAYING:
-                    if not tetris.game_over:
-                        # Controles del juego
-                        if event.key == pygame.K_LEFT:
-                            tetris.move_left()
-                        elif event.key == pygame.K_RIGHT:
-                            tetris.move_right()
-                        elif event.key == pygame.K_DOWN:
-                            tetris.move_down()
-                        elif event.key == pygame.K_UP:
-                            tetris.rotate_piece()
-                        elif event.key == pygame.K_SPACE:
-                            tetris.hard_drop()
-                        elif event.key == pygame.K_ESCAPE:
-                            state = STATE_MENU
-                    else:
-                        # Game Over - opciones
-                        if event.key == pygame.K_r:
-                            tetris.reset()
-                        elif event.key == pygame.K_ESCAPE:
-                            state = STATE_MENU
+                current = active_state(state, tetris)
+
+                # Acción sobre la partida (mover, rotar, reiniciar...)
+                handler = HANDLERS[current].get(event.key)
+                if handler:
+                    handler(tetris)
+
+                # Cambio de pantalla
+                next_state = TRANSITIONS[current].get(event.key)
+                if next_state == STATE_QUIT:
+                    running = False
+                elif next_state == STATE_PLAYING:
+                    state = STATE_PLAYING
+                    tetris = Tetris()  # Crear nuevo juego
+                elif next_state:
+                    state = next_state
 
         # Actualizar lógica del juego
         if state == STATE_PLAYING and tetris:
-            tetris.update()
+            tetris.update(dt)
+
+        # Al cambiar de pantalla (o al llegar al Game Over) se sube todo
+        view = active_state(state, tetris)
+        if view != last_view:
+            full_update = True
+            last_view = view
 
         # Dibujar según el estado
-        screen.fill(BLACK)
+        # Zonas de la pantalla que han cambiado en este frame
+        dirty_rects = []
 
         if state == STATE_MENU:
+            # Pantalla estática: ya precalculada, ocupa toda la ventana
+            # y solo se sube entera al entrar en ella
             draw_menu(screen, font, small_font)
 
         elif state == STATE_CONTROLS:
+            # Pantalla estática: solo se sube entera al entrar en ella
             draw_controls_screen(screen, font, small_font)
 
         elif state == STATE_PLAYING:
-            draw_board(screen, tetris.board)
+            screen.fill(BLACK)
+            dirty_rects.append(draw_board(screen, tetris.board))
             draw_piece(screen, tetris.current_piece)
-            draw_next_piece(screen, tetris.next_piece, small_font)
-            draw_info(screen, tetris, font, small_font)
+            dirty_rects.append(draw_next_piece(screen, tetris.next_piece, small_font))
+            dirty_rects.append(draw_info(screen, tetris, font, small_font))
 
             if tetris.game_over:
+                # El Game Over no cambia hasta que se pulsa una tecla
                 draw_game_over(screen, tetris.score, font)
-
-        # Actualizar pantalla
-        pygame.display.flip()
+                dirty_rects = []
+
+        # Actualizar pantalla: entera solo cuando hace falta
+        if full_update:
+            pygame.display.flip()
+            full_update = False
+        elif dirty_rects:
+            pygame.display.update(dirty_rects)
 
     # Salir
     pygame.quit()